@@ -2,12 +2,15 @@ import argparse
 import asyncio
 import logging
 
+try:
+    import uvloop
+except ImportError:  # Optional: fall back to the default asyncio event loop
+    uvloop = None
+
 from src.machine import Machine
 from src.websocket_server import WebSocketServer
 from src.ble_client import BLEClient
 
-logging.basicConfig(level=logging.INFO,
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 PORT: int = 8080
@@ -26,12 +29,13 @@ LOG_LEVELS: dict[str, int] = {
 async def main():
     parser = argparse.ArgumentParser(
         description="Coffee Roaster BLE Interface")
-    parser.add_argument("--log-level", choices=LOG_LEVELS.keys(), default="warning",
+    parser.add_argument("--log-level", choices=LOG_LEVELS, default="warning",
                         help="Set the logging level (debug, info, warning, error, critical, none)")
     args = parser.parse_args()
 
     log_level = LOG_LEVELS[args.log_level]
-    logging.basicConfig(level=log_level)
+    logging.basicConfig(level=log_level, force=True,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
     ws_server: WebSocketServer = WebSocketServer(port=PORT)
 
@@ -52,8 +56,7 @@ async def main():
     except asyncio.CancelledError:
         logger.info("Application tasks cancelled. Shutting down gracefully.")
     except Exception as e:
-        logger.error(
-            f"An unhandled error occurred in main: {e}", exc_info=True)
+        logger.exception("An unhandled error occurred in main: %s", e)
     finally:
         logger.info("Application shutting down.")
         await ws_server.stop()
@@ -61,8 +64,11 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Application stopped by user (Ctrl+C).")
     except Exception as e:
-        logger.critical(f"Application crashed: {e}", exc_info=True)
+        logger.critical("Application crashed: %s", e, exc_info=True)
@@ -2,9 +2,10 @@ from bleak.backends.characteristic import BleakGATTCharacteristic
 import time
 import asyncio
 import logging
-from typing import Optional, Callable, Any, Literal
+from typing import Optional, Callable, Any, Dict, Literal, Tuple
 from bleak import BleakScanner, BleakClient
 from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
 from bleak.exc import BleakError
 from src.machine import Machine
 
@@ -27,8 +28,17 @@ class BLEClient:
         self.reconnection_attempts: int = 0
         self.max_reconnection_attempts: int = 5
         self.reconnection_delay: int = 5
+        self.heartbeat_idle_time: float = 20.0
         self.connection_event: asyncio.Event = asyncio.Event()
         self._heartbeat_task: Optional[asyncio.Task] = None
+        self._machine_methods: Dict[str, Tuple[Callable[..., Any], bool]] = {}
+        self._notification_queue: asyncio.Queue[None] = asyncio.Queue(maxsize=1)
+        self._notification_task: Optional[asyncio.Task] = None
+        self._scanner: Optional[BleakScanner] = None
+        self._device_found: asyncio.Event = asyncio.Event()
+        self._found_device: Optional[BLEDevice] = None
+        self._formatted_temperatures: Tuple[str, str] = self._format_temperatures()
+        self._readings: Optional[Dict[str, Any]] = None
 
     @property
     def status(self) -> BLEStatus:
@@ -46,56 +56,125 @@ class BLEClient:
 
     async def notification_handler(self, sender: BleakGATTCharacteristic, data: bytearray) -> None:
         """
-        Handles incoming BLE notifications. Decodes the message and calls the
-        registered notification callback.
+        Handles incoming BLE notifications. Decodes the message and signals the
+        notification worker, which calls the registered notification callback.
+        The signal queue holds a single entry, so a slow callback coalesces
+        pending updates instead of stalling the BLE receive path.
         """
         try:
             success = self.machine.decode_message(data)
 
             if success:
                 self.reconnection_attempts = 0  # Reset attempts on successful data
+                self._formatted_temperatures = self._format_temperatures()
+                self._readings = None
 
-                if self.notification_callback:
-                    try:
-                        await self.notification_callback()
-                    except Exception as callback_e:
-                        logger.error(
-                            f"Error in notification callback: {callback_e}")
+                if self.notification_callback and not self._notification_queue.full():
+                    self._notification_queue.put_nowait(None)
 
             return None
         except Exception as e:
-            logger.error(f"Error in notification handler: {e}")
+            logger.error("Error in notification handler: %s", e)
             return None
 
+    async def _dispatch_notifications(self) -> None:
+        """
+        Calls the notification callback once for each signal from the notification handler.
+        """
+        while True:
+            await self._notification_queue.get()
+
+            if self.notification_callback:
+                try:
+                    await self.notification_callback()
+                except Exception as callback_e:
+                    logger.error(
+                        "Error in notification callback: %s", callback_e)
+
+    def _is_target_device(self, device: BLEDevice, advertisement_data: AdvertisementData) -> bool:
+        """Returns True if the advertising device's name starts with the configured prefix."""
+        return bool(device.name and device.name.startswith(self.device_name_prefix))
+
+    def _on_advertisement(self, device: BLEDevice, advertisement_data: AdvertisementData) -> None:
+        """Scanner detection callback. Records the first matching device of the current scan."""
+        if not self._device_found.is_set() and self._is_target_device(device, advertisement_data):
+            self._found_device = device
+            self._device_found.set()
+
+    async def _scan_for_device(self, timeout: float, min_duration: float = 0.0) -> Optional[BLEDevice]:
+        """
+        Scans for the target device using a scanner shared across reconnection cycles.
+
+        Args:
+            timeout: Maximum number of seconds to keep scanning once min_duration has elapsed.
+            min_duration: Minimum number of seconds before returning, even if the device is found
+                          sooner. Lets a reconnection backoff overlap with the scan, which keeps
+                          running until the device is returned.
+
+        Returns:
+            The first matching device seen, or None if none advertised before the timeout.
+        """
+        if self._scanner is None:
+            self._scanner = BleakScanner(
+                detection_callback=self._on_advertisement)
+
+        loop = asyncio.get_running_loop()
+        not_before: float = loop.time() + min_duration
+
+        self._found_device = None
+        self._device_found.clear()
+        try:
+            await self._scanner.start()
+            try:
+                await asyncio.wait_for(self._device_found.wait(), min_duration + timeout)
+                # Keep scanning through the rest of the backoff: BlueZ may drop a
+                # device once scanning stops, which would fail the connect that follows
+                await asyncio.sleep(max(0.0, not_before - loop.time()))
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                await self._scanner.stop()
+        except Exception:
+            # Honour the backoff even if the scanner fails straight away
+            await asyncio.sleep(max(0.0, not_before - loop.time()))
+            raise
+
+        return self._found_device
+
     async def run(self) -> None:
         """
         Main loop for the BLE client, handling scanning, connection, and reconnection.
         """
+        if self._notification_task is None or self._notification_task.done():
+            self._notification_task = asyncio.create_task(
+                self._dispatch_notifications())
+
+        retry_delay: float = 0.0
         while True:
             if self.reconnection_attempts >= self.max_reconnection_attempts:
                 logger.warning(
-                    f"Maximum reconnection attempts ({self.max_reconnection_attempts}) reached. Waiting longer before retrying...")
-                await asyncio.sleep(60)
+                    "Maximum reconnection attempts (%d) reached. Waiting longer before retrying...",
+                    self.max_reconnection_attempts)
+                retry_delay += 60
                 self.reconnection_attempts = 0
 
             target_device: Optional[BLEDevice] = None
             try:
-                devices = await BleakScanner.discover(timeout=5.0)
-                for device in devices:
-                    if device.name and device.name.startswith(self.device_name_prefix):
-                        logger.debug(
-                            f"Found matching device: {device.name} ({device.address})")
-                        target_device = device
-                        break
+                # Scan while the retry delay elapses instead of after it
+                target_device = await self._scan_for_device(timeout=5.0, min_duration=retry_delay)
+                retry_delay = 0.0
 
                 if not target_device:
                     logger.warning(
-                        f"No device starting with '{self.device_name_prefix}' found. Retrying in 10 seconds...")
-                    await asyncio.sleep(10)
+                        "No device starting with '%s' found. Retrying in 10 seconds...",
+                        self.device_name_prefix)
+                    retry_delay = 10.0
                     continue
 
                 logger.debug(
-                    f"Attempting to connect to {target_device.name} ({target_device.address})")
+                    "Found matching device: %s (%s)", target_device.name, target_device.address)
+                logger.debug(
+                    "Attempting to connect to %s (%s)", target_device.name, target_device.address)
 
                 def handle_disconnect(_: BleakClient) -> None:
                     self.connection_event.set()
@@ -116,32 +195,30 @@ class BLEClient:
                         self.client = client
                         self.reconnection_attempts = 0
 
+                        # Setup failures count as failed attempts and fall through to the backoff
                         if not await self.machine.discover_characteristics(client):
                             logger.error(
                                 "Failed to discover necessary characteristics")
-                            self.connection_event.set()
-                            continue
-
-                        if not await self.machine.subscribe_to_notifications(client, self.notification_handler):
+                            self.reconnection_attempts += 1
+                        elif not await self.machine.subscribe_to_notifications(client, self.notification_handler):
                             logger.error(
                                 "Failed to subscribe to notifications")
-                            self.connection_event.set()
-                            continue
-
-                        self._heartbeat_task = asyncio.create_task(
-                            self._send_heartbeat())
-                        await self.connection_event.wait()
+                            self.reconnection_attempts += 1
+                        else:
+                            self._heartbeat_task = asyncio.create_task(
+                                self._send_heartbeat())
+                            await self.connection_event.wait()
 
                 except BleakError as e:
                     logger.error(
-                        f"BleakError while interacting with device: {e}")
+                        "BleakError while interacting with device: %s", e)
                     self.reconnection_attempts += 1
                 except asyncio.CancelledError:
                     logger.debug(
                         "Connection attempt or active connection cancelled.")
                 except Exception as e:
-                    logger.error(
-                        f"Unexpected error during BLE interaction: {e}", exc_info=True)
+                    logger.exception(
+                        "Unexpected error during BLE interaction: %s", e)
                     self.reconnection_attempts += 1
                 finally:
                     self.client = None
@@ -150,16 +227,15 @@ class BLEClient:
                         self._heartbeat_task = None
 
             except BleakError as e:
-                logger.error(f"BleakError during scanning or connection: {e}")
+                logger.error("BleakError during scanning or connection: %s", e)
                 self.reconnection_attempts += 1
             except Exception as e:
-                logger.error(f"Unexpected error in BLE client loop: {e}")
+                logger.error("Unexpected error in BLE client loop: %s", e)
                 self.reconnection_attempts += 1
 
-            # Exponential backoff for reconnection attempts
-            backoff_delay: float = min(
+            # Exponential backoff for reconnection attempts, applied by the next scan
+            retry_delay = min(
                 60.0, self.reconnection_delay * (1.5 ** min(self.reconnection_attempts, 10)))
-            await asyncio.sleep(backoff_delay)
 
     async def stop(self) -> None:
         """
@@ -170,33 +246,44 @@ class BLEClient:
             self._heartbeat_task.cancel()
             self._heartbeat_task = None
 
+        if self._notification_task and not self._notification_task.done():
+            self._notification_task.cancel()
+            self._notification_task = None
+
         if self.client is not None and self.client.is_connected:
             try:
                 await self.client.disconnect()
                 logger.info("Disconnected from BLE device.")
             except Exception as e:
-                logger.error(f"Error during disconnection: {e}")
+                logger.error("Error during disconnection: %s", e)
         else:
             logger.info("No active BLE client to disconnect.")
 
     async def _send_heartbeat(self) -> None:
         """
-        Sends a periodic heartbeat command to the device to keep the connection alive.
+        Sends a heartbeat command to the device to keep the connection alive. Sleeps until
+        the connection has been idle for heartbeat_idle_time rather than polling, and waits
+        at least that long after connecting or after the previous heartbeat.
         """
+        machine: Machine = self.machine
         try:
+            last_heartbeat_time: float = time.monotonic()
             while self.client is not None and self.client.is_connected:
-                await asyncio.sleep(15)
+                idle_deadline: float = max(
+                    machine.last_command_time, last_heartbeat_time) + self.heartbeat_idle_time
+                await asyncio.sleep(max(0.0, idle_deadline - time.monotonic()))
 
-                current_time: float = time.time()
-                time_since_last_cmd: float = current_time - self.machine.last_command_time
+                current_time: float = time.monotonic()
+                time_since_last_cmd: float = current_time - machine.last_command_time
 
-                if time_since_last_cmd > 20 and self.client is not None and self.client.is_connected:
+                if time_since_last_cmd >= self.heartbeat_idle_time and self.client is not None and self.client.is_connected:
                     logger.debug("Sending heartbeat to keep connection alive")
+                    last_heartbeat_time = current_time
                     # Send a benign command (like setting fan to its current value)
                     client_instance = self.client
                     if client_instance:
-                        fan_value: int = self.machine.get_fan_value()
-                        await self.machine.set_fan(client_instance, fan_value)
+                        fan_value: int = machine.get_fan_value()
+                        await machine.set_fan(client_instance, fan_value)
                     else:
                         logger.warning(
                             "Heartbeat attempted but client is unexpectedly None.")
@@ -204,7 +291,7 @@ class BLEClient:
         except asyncio.CancelledError:
             logger.debug("Heartbeat task cancelled")
         except Exception as e:
-            logger.error(f"Error in heartbeat: {e}")
+            logger.error("Error in heartbeat: %s", e)
             self.connection_event.set()
 
     async def execute_command(self, command_name: str, *args, **kwargs) -> bool:
@@ -224,19 +311,31 @@ class BLEClient:
             return False
 
         try:
-            method = getattr(self.machine, command_name)
-            if asyncio.iscoroutinefunction(method):
+            resolved = self._machine_methods.get(command_name)
+            if resolved is None:
+                machine_method = getattr(self.machine, command_name)
+                resolved = (machine_method,
+                            asyncio.iscoroutinefunction(machine_method))
+                self._machine_methods[command_name] = resolved
+
+            method, is_coroutine = resolved
+            if is_coroutine:
                 success: bool = await method(self.client, *args, **kwargs)
             else:
                 success: bool = method(*args, **kwargs)
             return success
         except AttributeError:
-            logger.error(f"Unknown command: {command_name}")
+            logger.error("Unknown command: %s", command_name)
             return False
         except Exception as e:
-            logger.error(f"Error executing command {command_name}: {e}")
+            logger.error("Error executing command %s: %s", command_name, e)
             return False
 
+    def _format_temperatures(self) -> Tuple[str, str]:
+        """Formats the machine's bean and environment temperatures for clients."""
+        return (f"{self.machine.get_bean_temperature():.2f}",
+                f"{self.machine.get_environment_temperature():.2f}")
+
     # Expose machine's read-only properties directly
     @property
     def bean_temperature(self) -> float:
@@ -248,6 +347,27 @@ class BLEClient:
         """Returns the current environment temperature from the machine."""
         return self.machine.get_environment_temperature()
 
+    @property
+    def formatted_temperatures(self) -> Tuple[str, str]:
+        """Returns the bean and environment temperatures as of the last notification, formatted to two decimals."""
+        return self._formatted_temperatures
+
+    @property
+    def readings(self) -> Dict[str, Any]:
+        """
+        Returns the latest readings as sent to clients (BT, ET, heater, fan).
+        The dictionary is cached until the next notification and must not be modified.
+        """
+        if self._readings is None:
+            bean_temperature, environment_temperature = self._formatted_temperatures
+            self._readings = {
+                "BT": bean_temperature,
+                "ET": environment_temperature,
+                "heater": self.heater_value,
+                "fan": self.fan_value,
+            }
+        return self._readings
+
     @property
     def heater_value(self) -> int:
         """Returns the current heater value from the machine."""
@@ -1,4 +1,4 @@
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Callable, Dict, Tuple
 from logging import Logger
 import logging
 import asyncio
@@ -12,50 +12,67 @@ class CommandHandler:
 
     def __init__(self, ble_client: BLEClient):
         self.ble_client = ble_client
-        self._pending_commands: Dict[str, asyncio.Task] = {}
-
-        self.simple_commands = {
-            "fanUp": ("fan_up", []),
-            "fanDown": ("fan_down", []),
-            "heaterUp": ("heater_up", []),
-            "heaterDown": ("heater_down", []),
-            "pidOn": ("pid_on", []),
-            "pidOff": ("pid_off", []),
-        }
-
-        self.value_commands = {
+        # Commands waiting for the worker, ordered by their most recent request and
+        # each holding that request's arguments
+        self._latest_commands: Dict[str, Tuple[str, Tuple[Any, ...]]] = {}
+        self._commands_pending: asyncio.Event = asyncio.Event()
+        self._command_worker: Optional[asyncio.Task] = None
+
+        # WebSocket command -> (machine method name, value converter or None if the command takes no value).
+        # Every machine command is a BLE write; getData is answered separately.
+        self.machine_commands: Dict[str, Tuple[str, Optional[Callable[[Any], Any]]]] = {
+            "fanUp": ("fan_up", None),
+            "fanDown": ("fan_down", None),
+            "heaterUp": ("heater_up", None),
+            "heaterDown": ("heater_down", None),
+            "pidOn": ("pid_on", None),
+            "pidOff": ("pid_off", None),
             "setFan": ("set_fan", int),
             "setHeater": ("set_heater", int),
             "setPID": ("set_pid", float),
         }
 
-        self.async_commands = set(self.simple_commands.keys()) | set(
-            self.value_commands.keys())
+    async def _run_command_worker(self) -> None:
+        """
+        Execute queued BLE commands one at a time, in the order of their most recent
+        request, using the arguments of that request.
+        """
+        while True:
+            while not self._latest_commands:
+                self._commands_pending.clear()
+                await self._commands_pending.wait()
+            command = next(iter(self._latest_commands))
+            method_name, args = self._latest_commands.pop(command)
+            try:
+                success = await self.ble_client.execute_command(method_name, *args)
+                logger.debug(
+                    "Async command %s completed with success=%s", method_name, success)
+            except Exception as e:
+                logger.error("Error executing async command %s: %s", method_name, e)
 
-    async def _execute_command_async(self, task_id: str, method_name: str, *args) -> None:
+    def _schedule_command(self, command: str, method_name: str, *args) -> None:
         """
-        Execute a BLE command asynchronously and handle cleanup.
+        Queue a BLE command for the command worker. A request for a command that is
+        still waiting replaces the stale entry and moves to the back of the queue, so
+        commands run in the order the user last issued them.
 
         Args:
-            task_id: Unique identifier for this command task
+            command: The command name, used to coalesce repeated requests
             method_name: Name of the method to call on the BLE client
             *args: Arguments to pass to the method
         """
-        try:
-            success = await self.ble_client.execute_command(method_name, *args)
-            logger.debug(
-                f"Async command {method_name} completed with success={success}")
-        except Exception as e:
-            logger.error(f"Error executing async command {method_name}: {e}")
-        finally:
-            # Clean up completed task
-            if task_id in self._pending_commands:
-                del self._pending_commands[task_id]
+        self._latest_commands.pop(command, None)
+        self._latest_commands[command] = (method_name, args)
+        self._commands_pending.set()
+
+        if self._command_worker is None or self._command_worker.done():
+            self._command_worker = asyncio.create_task(
+                self._run_command_worker())
 
     async def process_command(self, command: str, value: Optional[Any] = None) -> Dict[str, Any]:
         """
         Process a command and return the response data.
-        Uses fire-and-forget pattern for BLE write commands to avoid blocking.
+        BLE write commands are queued for a background worker to avoid blocking.
 
         Args:
             command: The command name
@@ -64,110 +81,73 @@ class CommandHandler:
         Returns:
             Dictionary containing response data, status, and any error messages
         """
-        response: Dict[str, Any] = {}
-
-        if self._is_write_command(command) and self.ble_client.status != "Connected":
-            response.update({
+        # Artisan polls getData every sample, so answer it before any other checks
+        if command == "getData":
+            return await self._handle_get_data()
+
+        # One lookup identifies the command and, since every machine command is a write,
+        # gates it on the connection
+        machine_command = self.machine_commands.get(command)
+        if machine_command is None:
+            logger.warning("Unknown command received: %s", command)
+            return {
                 "status": "error",
-                "message": f"Cannot execute '{command}': BLE client is {self.ble_client.status}"
-            })
-            return response
+                "message": f"Unknown command: {command}"
+            }
 
-        if command == "getData":
-            response["data"] = {
-                "BT": f"{self.ble_client.bean_temperature:.2f}",
-                "ET": f"{self.ble_client.environment_temperature:.2f}",
-                "heater": self.ble_client.heater_value,
-                "fan": self.ble_client.fan_value,
+        ble_status = self.ble_client.status
+        if ble_status != "Connected":
+            return {
+                "status": "error",
+                "message": f"Cannot execute '{command}': BLE client is {ble_status}"
             }
-            response["status"] = "success"
 
-        elif command in self.value_commands:
+        return await self._handle_machine_command(command, machine_command, value)
+
+    async def _handle_get_data(self) -> Dict[str, Any]:
+        """Return the latest temperature readings and machine values."""
+        return {
+            "data": self.ble_client.readings,
+            "status": "success",
+        }
+
+    async def _handle_machine_command(self, command: str,
+                                      machine_command: Tuple[str, Optional[Callable[[Any], Any]]],
+                                      value: Optional[Any]) -> Dict[str, Any]:
+        """Convert the value if the command takes one, then queue it for the command worker."""
+        method_name, value_type = machine_command
+        args: Tuple[Any, ...] = ()
+
+        if value_type is not None:
             if value is None:
-                response.update({
+                return {
                     "status": "error",
                     "message": f"Command '{command}' requires a value"
-                })
-            else:
-                method_name, value_type = self.value_commands[command]
-                try:
-                    converted_value = value_type(value)
-
-                    if command in self.async_commands:
-                        task_id = f"{command}_{converted_value}_{asyncio.get_event_loop().time()}"
-
-                        existing_tasks = [
-                            tid for tid in self._pending_commands.keys() if tid.startswith(f"{command}_")]
-                        for tid in existing_tasks:
-                            self._pending_commands[tid].cancel()
-                            del self._pending_commands[tid]
-
-                        task = asyncio.create_task(
-                            self._execute_command_async(
-                                task_id, method_name, converted_value)
-                        )
-                        self._pending_commands[task_id] = task
-
-                        response["status"] = "accepted"
-                    else:
-                        success = await self.ble_client.execute_command(method_name, converted_value)
-                        response["status"] = "success" if success else "error"
-
-                except (ValueError, TypeError) as e:
-                    response.update({
-                        "status": "error",
-                        "message": f"Invalid {command.replace('set', '').lower()} value: {e}"
-                    })
-
-        elif command in self.simple_commands:
-            method_name, args = self.simple_commands[command]
-
-            if command in self.async_commands:
-                task_id = f"{command}_{asyncio.get_event_loop().time()}"
-
-                existing_tasks = [
-                    tid for tid in self._pending_commands.keys() if tid.startswith(f"{command}_")]
-                for tid in existing_tasks:
-                    self._pending_commands[tid].cancel()
-                    del self._pending_commands[tid]
-
-                task = asyncio.create_task(
-                    self._execute_command_async(task_id, method_name, *args)
-                )
-                self._pending_commands[task_id] = task
-
-                response["status"] = "accepted"
-                response["message"] = f"Command {command} accepted for execution"
-            else:
-                success = await self.ble_client.execute_command(method_name, *args)
-                response["status"] = "success" if success else "error"
-                if not success:
-                    response["message"] = f"Failed to execute {command}"
-
-        else:
-            logger.warning(f"Unknown command received: {command}")
-            response.update({
-                "status": "error",
-                "message": f"Unknown command: {command}"
-            })
-
-        return response
+                }
+            try:
+                # JSON numbers usually arrive already of the right type
+                args = (value if type(value) is value_type else value_type(value),)
+            except (ValueError, TypeError) as e:
+                return {
+                    "status": "error",
+                    "message": f"Invalid {command.replace('set', '').lower()} value: {e}"
+                }
 
-    def _is_write_command(self, command: str) -> bool:
-        return command != "getData"
+        self._schedule_command(command, method_name, *args)
+        return {
+            "status": "accepted",
+            "message": f"Command {command} accepted for execution"
+        }
 
     async def cleanup_pending_commands(self) -> None:
         """Clean up any pending async commands. Call this when shutting down."""
-        for task_id, task in list(self._pending_commands.items()):
-            if not task.done():
-                task.cancel()
-            del self._pending_commands[task_id]
+        if self._command_worker and not self._command_worker.done():
+            self._command_worker.cancel()
+        self._command_worker = None
+
+        self._latest_commands.clear()
+        self._commands_pending.clear()
 
     def get_pending_command_count(self) -> int:
         """Return the number of currently pending async commands."""
-        completed_tasks = [
-            tid for tid, task in self._pending_commands.items() if task.done()]
-        for tid in completed_tasks:
-            del self._pending_commands[tid]
-
-        return len(self._pending_commands)
+        return len(self._latest_commands)
@@ -1,4 +1,4 @@
-from typing import Optional, Callable, Any
+from functools import lru_cache
 from math import floor
 import asyncio
 import logging
@@ -12,6 +12,12 @@ import time
 logger: logging.Logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=512)
+def encode_command(command: str) -> bytes:
+    """Encodes a serial command and its trailing newline, caching the result."""
+    return (command + "\n").encode('ascii')
+
+
 class SerialCommands:
     """Defines serial commands for the machine."""
     FAN_DOWN: str = "IO3,down"
@@ -20,9 +26,18 @@ class SerialCommands:
     FIRE_UP: str = "OT1,up"
     PID_ON: str = "PID,on"
     PID_OFF: str = "PID,off"
-    FAN_VAL: str = "IO3,{n}"
-    HEATER_VAL: str = "OT1,{n}"
-    PID_VAL: str = "PID,SV,{n}"
+
+    @staticmethod
+    def fan_val(n: int) -> str:
+        return f"IO3,{n}"
+
+    @staticmethod
+    def heater_val(n: int) -> str:
+        return f"OT1,{n}"
+
+    @staticmethod
+    def pid_val(n: int) -> str:
+        return f"PID,SV,{n}"
 
 
 class Machine:
@@ -42,6 +57,8 @@ class Machine:
         self.last_command_time: float = 0.0
         self.command_lock: asyncio.Lock = asyncio.Lock()
         self.command_interval: float = 0.1
+        self.max_error_backoff: float = 1.0
+        self._consecutive_failures: int = 0
 
     async def discover_characteristics(self, client: BleakClient) -> bool:
         """
@@ -74,7 +91,7 @@ class Machine:
             True if subscription is successful, False otherwise.
         """
         if not self.notify_characteristic_uuid:
-            logging.error("No notification characteristic discovered.")
+            logger.error("No notification characteristic discovered.")
             return False
         await client.start_notify(self.notify_characteristic_uuid, callback)
         return True
@@ -94,7 +111,7 @@ class Machine:
                 await client.stop_notify(self.notify_characteristic_uuid)
                 return True
             except Exception as e:
-                logging.error(f"Error stopping notifications: {e}")
+                logger.error("Error stopping notifications: %s", e)
                 return False
         return False
 
@@ -103,6 +120,7 @@ class Machine:
         Decodes the incoming bytearray message from the BLE device.
 
         Expected format: `[env_temp,bean_temp,heater_val,fan_val]` (e.g., `[25.5,100.2,50,75]`)
+        The fields are parsed straight from the bytes, without decoding to a string first.
 
         Args:
             data: The bytearray received from the BLE notification.
@@ -111,24 +129,33 @@ class Machine:
             True if the message is successfully decoded and parsed, False otherwise.
         """
         try:
-            data_str: str = data.decode(
-                'utf-8').strip().replace("\x00", "").strip()
-            parsed_data: str = data_str[1:-1]
-            environment_temp_str, bean_temp_str, heater_value_str, fan_value_str = parsed_data.split(
-                ',')
-            self.bean_temperature = float(bean_temp_str)
-            self.environment_temperature = float(environment_temp_str)
-            self.heater_value = int(heater_value_str)
-            self.fan_value = int(fan_value_str)
+            frame: Union[bytes, bytearray] = data.replace(b"\x00", b"").strip()
+            if not (frame.startswith(b"[") and frame.endswith(b"]") and frame.count(b",") == 3):
+                logger.error("Malformed message frame, Data: %s", data)
+                return False
+            environment_temp_field, bean_temp_field, heater_value_field, fan_value_field = frame[1:-1].split(
+                b',')
+            bean_temperature: float = float(bean_temp_field)
+            environment_temperature: float = float(environment_temp_field)
+            heater_value: int = int(heater_value_field)
+            fan_value: int = int(fan_value_field)
+
+            self.bean_temperature = bean_temperature
+            self.environment_temperature = environment_temperature
+            self.heater_value = heater_value
+            self.fan_value = fan_value
             return True
         except Exception as e:
-            logging.error(f"Error decoding message: {e}, Data: {data}")
+            logger.error("Error decoding message: %s, Data: %s", e, data)
             return False
 
     async def send_command(self, client: BleakClient, command: str) -> bool:
         """
         Sends a command to the BLE device, respecting a rate limit.
 
+        Writes are spaced at least `command_interval` apart; failed writes back off
+        exponentially up to `max_error_backoff` seconds.
+
         Args:
             client: The BleakClient instance connected to the BLE device.
             command: The string command to send.
@@ -137,34 +164,38 @@ class Machine:
             True if the command is sent successfully, False otherwise.
         """
         if not self.write_characteristic_uuid:
-            logging.error("No write characteristic discovered.")
+            logger.error("No write characteristic discovered.")
             return False
         async with self.command_lock:
             try:
-                time_since_last_command = time.time() - self.last_command_time
+                time_since_last_command = time.monotonic() - self.last_command_time
                 if time_since_last_command < self.command_interval:
                     sleep_time = self.command_interval - time_since_last_command
                     await asyncio.sleep(sleep_time)
 
-                command_with_newline: str = command + "\n"
-                command_bytes: bytearray = ascii2ab(command_with_newline)
+                command_bytes: bytes = encode_command(command)
                 if not client.is_connected:
-                    logging.error(
+                    logger.error(
                         "Cannot send command: BLE client is disconnected")
                     return False
                 await client.write_gatt_char(self.write_characteristic_uuid, command_bytes, response=True)
-                self.last_command_time = time.time()
-                await asyncio.sleep(1.0)
+                self.last_command_time = time.monotonic()
+                self._consecutive_failures = 0
                 return True
             except Exception as e:
-                logging.error(f"Error sending command: {e}")
-                await asyncio.sleep(2.0)
+                logger.error("Error sending command: %s", e)
+                # Back off exponentially on repeated failures, capped so a
+                # recovered device picks up the next command quickly.
+                backoff: float = min(self.max_error_backoff,
+                                     self.command_interval * 2 ** min(self._consecutive_failures, 10))
+                self._consecutive_failures += 1
+                await asyncio.sleep(backoff)
                 return False
 
     async def set_fan(self, client: BleakClient, value: int) -> bool:
         if not (0 <= value <= 100):
             return False
-        command: str = SerialCommands.FAN_VAL.replace("{n}", str(value))
+        command: str = SerialCommands.fan_val(value)
         return await self.send_command(client, command)
 
     async def fan_up(self, client: BleakClient) -> bool:
@@ -176,7 +207,7 @@ class Machine:
     async def set_heater(self, client: BleakClient, value: int) -> bool:
         if not (0 <= value <= 100):
             return False
-        command: str = SerialCommands.HEATER_VAL.replace("{n}", str(value))
+        command: str = SerialCommands.heater_val(value)
         return await self.send_command(client, command)
 
     async def heater_up(self, client: BleakClient) -> bool:
@@ -189,7 +220,7 @@ class Machine:
         if value <= 0:
             return False
         value_int: int = floor(value)
-        command: str = SerialCommands.PID_VAL.replace("{n}", str(value_int))
+        command: str = SerialCommands.pid_val(value_int)
         self.pid_value = value_int
         return await self.send_command(client, command)
 
@@ -1,4 +1,4 @@
-from typing import Optional, Any, Dict, Union, Set
+from typing import Optional, Any, Dict, Union, Set, Tuple
 from logging import Logger
 import asyncio
 import json
@@ -27,6 +27,7 @@ class WebSocketServer:
         self.ble_client: Optional[BLEClient] = None
         self.command_handler: Optional[CommandHandler] = None
         self.server: Optional[Server] = None
+        self._broadcast_key: Optional[Tuple[str, str, str]] = None
 
     def set_ble_client(self, ble_client: BLEClient) -> None:
         """Sets the BLE client and registers the notification callback."""
@@ -35,48 +36,67 @@ class WebSocketServer:
         ble_client.set_notification_callback(self.on_temperature_update)
 
     async def on_temperature_update(self) -> None:
-        """Callback triggered on BLE temperature notification. Prepares and broadcasts the update."""
-        if not self.ble_client:
+        """
+        Callback triggered on BLE temperature notification. Prepares and broadcasts the update,
+        skipping it when the readings and status match the last broadcast.
+        """
+        if not self.ble_client or not self.connected_clients:
             return
 
+        bean_temperature, environment_temperature = self.ble_client.formatted_temperatures
+        status = self.ble_client.status
+        key = (bean_temperature, environment_temperature, status)
+        if key == self._broadcast_key:
+            return
+
+        self._broadcast_key = key
         message = json.dumps({
             "data": {
-                "BT": f"{self.ble_client.bean_temperature:.2f}",
-                "ET": f"{self.ble_client.environment_temperature:.2f}",
-                "status": self.ble_client.status
+                "BT": bean_temperature,
+                "ET": environment_temperature,
+                "status": status
             }
         })
         await self.broadcast(message)
 
     async def broadcast(self, message: str) -> None:
-        """Sends a message to all connected clients."""
+        """
+        Sends a message to all connected clients. The frame is written to each
+        connection's buffer directly, without creating a task per client.
+        """
         if not self.connected_clients:
             return
 
-        tasks = [client.send(message) for client in self.connected_clients]
-        await asyncio.gather(*tasks, return_exceptions=True)
-        logger.debug(
-            f"Broadcasted message to {len(self.connected_clients)} clients.")
+        websockets.broadcast(self.connected_clients, message)
+        logger.debug("Broadcasted message to %d clients.",
+                     len(self.connected_clients))
 
     async def handler(self, websocket: ServerConnection) -> None:
         """Handles a new WebSocket connection."""
         self.connected_clients.add(websocket)
-        logger.debug(
-            f"Client connected: {websocket.remote_address}. Total clients: {len(self.connected_clients)}")
+        self._broadcast_key = None  # Send the next update even if it repeats the last one
+        logger.debug("Client connected: %s. Total clients: %d",
+                     websocket.remote_address, len(self.connected_clients))
         try:
             await self.consumer_handler(websocket)
         finally:
             self.connected_clients.remove(websocket)
-            logger.debug(
-                f"Client disconnected: {websocket.remote_address}. Total clients: {len(self.connected_clients)}")
+            logger.debug("Client disconnected: %s. Total clients: %d",
+                         websocket.remote_address, len(self.connected_clients))
 
     async def consumer_handler(self, websocket: ServerConnection) -> None:
         """Handles incoming messages from a single client."""
+        # Resolved once per connection rather than on every message
+        remote_address = websocket.remote_address
         async for message in websocket:
             try:
                 data: Dict[str, Any] = json.loads(message)
-                logger.debug(
-                    f"Received from {websocket.remote_address}: {data}")
+                logger.debug("Received from %s: %s", remote_address, data)
+
+                if not isinstance(data, dict):
+                    logger.error("Invalid message format received from client.")
+                    await websocket.send(json.dumps({"status": "error", "message": "Invalid message format"}))
+                    continue
 
                 if not self.ble_client or not self.command_handler:
                     response = {
@@ -87,20 +107,21 @@ class WebSocketServer:
                     await websocket.send(json.dumps(response))
                     continue
 
-                await self.process_command(websocket, data)
+                await self.process_command(websocket, data, remote_address)
 
             except json.JSONDecodeError:
                 logger.error("Invalid JSON received from client.")
                 await websocket.send(json.dumps({"status": "error", "message": "Invalid JSON"}))
             except Exception as e:
-                logger.error(f"Error processing message: {e}")
+                logger.error("Error processing message: %s", e)
                 try:
                     await websocket.send(json.dumps({"status": "error", "message": f"An error occurred: {e}"}))
                 except ConnectionClosed:
                     pass
 
-    async def process_command(self, websocket: ServerConnection, data: Dict[str, Any]) -> None:
-        """Processes a single command received from a client."""
+    async def process_command(self, websocket: ServerConnection, data: Dict[str, Any],
+                              remote_address: Any) -> None:
+        """Processes a single command received from a client at remote_address."""
         assert self.command_handler is not None
 
         command: Optional[str] = data.get("command")
@@ -122,16 +143,19 @@ class WebSocketServer:
             return
 
         response = {"id": req_id, **command_response}
+        message: str = json.dumps(response)
 
-        logger.debug(
-            f"Sending response to {websocket.remote_address}: {json.dumps(response)}")
-        await websocket.send(json.dumps(response))
+        logger.debug("Sending response to %s: %s", remote_address, message)
+        await websocket.send(message)
 
     async def start(self) -> None:
         """Starts the WebSocket server using the modern async context manager."""
-        async with websockets.serve(self.handler, self.host, self.port) as server:
+        # Messages are a few dozen bytes on a local connection, so permessage-deflate
+        # would only cost CPU, once per client for every broadcast.
+        async with websockets.serve(self.handler, self.host, self.port,
+                                    compression=None) as server:
             self.server = server
-            logger.info(f"WebSocket server started on {self.host}:{self.port}")
+            logger.info("WebSocket server started on %s:%s", self.host, self.port)
             await asyncio.Future()
 
     async def stop(self) -> None: